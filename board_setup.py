@@ -1,20 +1,140 @@
+import functools
+import random
 import subprocess
+import sys
+from array import array
+
+from movegen_kernels import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_CAPTURES,
+    PAWN_DOUBLE,
+    PAWN_PUSH,
+    SQ,
+    bishop_attacks,
+    rook_attacks,
+    squares_between,
+)
+from utils import convert_position
+
+# Piece types in FEN order (P N B R Q K) so derived tables can share indices.
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PIECE_TYPE_NAMES = ("pawn", "knight", "bishop", "rook", "queen", "king")
+COLORS = ("white", "black")
+
+# piece index = color offset (0 for white, 6 for black) + piece type.
+COLOR_OFFSET = {"white": 0, "black": 6}
+PIECES = [(color, piece_type) for color in COLORS for piece_type in range(6)]
+
+# Sentinel index for an empty square.
+EMPTY = 12
+
+# Display glyphs indexed by piece index, with the EMPTY slot last.
+SYMBOLS = ("♙", "♘", "♗", "♖", "♕", "♔", "♟", "♞", "♝", "♜", "♛", "♚", "·")
+
+# FEN piece letters indexed by piece index.
+FEN_CHAR = b"PNBRQKpnbrqk"
+
+# Zobrist keys: one 64-bit key per (piece index, square) plus a side-to-move
+# key, drawn from a fixed seed so hashes are stable across runs.
+_zobrist_rng = random.Random(0xDEAD)
+ZOBRIST_PIECE = [[_zobrist_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
 
 
 class ChessPiece:
-    """Represents a chess piece with color and type attributes."""
+    """Represents a chess piece with color and type attributes.
+
+    piece_type is one of the integer constants PAWN..KING; use type_name
+    for the human-readable form.
+    """
 
     def __init__(self, color, piece_type):
         self.color = color
         self.piece_type = piece_type
         self.has_moved = False
 
+    @property
+    def type_name(self):
+        return PIECE_TYPE_NAMES[self.piece_type]
+
     def __repr__(self):
-        return f"{self.color} {self.piece_type}"
+        return f"{self.color} {self.type_name}"
+
+
+def _make_pawn_targets(color, enemy_color, down_shift, up_shift):
+    """Specialize pawn target computation for one color.
+
+    The color's mask tables, opponent, and push direction are bound as
+    closure constants, leaving no per-call color branch. One of the two
+    shifts is always zero; together they move the occupancy one rank
+    along the push direction so a blocked intermediate square also
+    vetoes the double push.
+    """
+    push = PAWN_PUSH[color]
+    double = PAWN_DOUBLE[color]
+    captures = PAWN_CAPTURES[color]
+
+    def pawn_targets(board, from_sq, color):
+        empty = ~board.occ
+        blocked = (board.occ >> down_shift) << up_shift
+        return (
+            (push[from_sq] & empty)
+            | (double[from_sq] & empty & ~blocked)
+            | (captures[from_sq] & board.color_bb[enemy_color])
+        )
+
+    return pawn_targets
+
+
+def _knight_targets(board, from_sq, color):
+    return KNIGHT_ATTACKS[from_sq]
+
+
+def _bishop_targets(board, from_sq, color):
+    return bishop_attacks(from_sq, board.occ)
+
+
+def _rook_targets(board, from_sq, color):
+    return rook_attacks(from_sq, board.occ)
+
+
+def _queen_targets(board, from_sq, color):
+    return rook_attacks(from_sq, board.occ) | bishop_attacks(from_sq, board.occ)
+
+
+def _king_targets(board, from_sq, color):
+    return KING_ATTACKS[from_sq]
+
+
+_WHITE_PAWN_TARGETS = _make_pawn_targets("white", "black", 8, 0)
+_BLACK_PAWN_TARGETS = _make_pawn_targets("black", "white", 0, 8)
+
+# Dispatch table indexed by the full 0-11 piece index, so each color's
+# pawn resolves straight to its specialized closure.
+TARGETS = (
+    _WHITE_PAWN_TARGETS,
+    _knight_targets,
+    _bishop_targets,
+    _rook_targets,
+    _queen_targets,
+    _king_targets,
+    _BLACK_PAWN_TARGETS,
+    _knight_targets,
+    _bishop_targets,
+    _rook_targets,
+    _queen_targets,
+    _king_targets,
+)
 
 
 class ChessBoard:
-    """Class representing the chess board and managing gameplay with Stockfish."""
+    """Class representing the chess board and managing gameplay with Stockfish.
+
+    The board is stored as 12 bitboards (one 64-bit int per (color, piece type)
+    pair) plus cached occupancy bitboards, so piece queries and moves are plain
+    integer bitwise operations instead of nested-list traversals.
+    """
 
     DIFFICULTY_SETTINGS = {
         "beginner": {"skill_level": 3, "depth": 5},
@@ -28,10 +148,20 @@ class ChessBoard:
         stockfish_path="C:/Users/muham/Desktop/stockfish/stockfish-windows-x86-64-avx2",
         difficulty="intermediate",
     ):
-        self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.bb = [0] * 12
+        self.squares = bytearray([EMPTY]) * 64  # piece index per square
+        self.color_bb = {"white": 0, "black": 0}
+        self.occ = 0
+        self.moved = 0  # squares whose occupant has moved at least once
         self.current_turn = "white"
         self.stockfish_path = stockfish_path
         self.difficulty = difficulty
+        # Bounded LRU over engine replies, keyed by (zobrist, depth); it
+        # lives and dies with this instance's engine session, so stale
+        # entries cannot outlive the process they came from.
+        self._cached_bestmove = functools.lru_cache(maxsize=4096)(
+            self._bestmove_for_position
+        )
         self.setup_board()
         self.stockfish_process = self.initialize_stockfish()
         self.configure_difficulty(difficulty)
@@ -39,19 +169,20 @@ class ChessBoard:
     def initialize_stockfish(self):
         """Initialize the Stockfish chess engine process."""
         try:
+            # UCI is plain ASCII, so keep the pipes in binary mode and skip
+            # the per-line text codec during long searches.
             process = subprocess.Popen(
                 [self.stockfish_path],
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=1,
+                bufsize=-1,
             )
             # Send UCI command and wait for response
-            process.stdin.write("uci\n")
+            process.stdin.write(b"uci\n")
             process.stdin.flush()
             while True:
                 output = process.stdout.readline().strip()
-                if "uciok" in output:
+                if b"uciok" in output:
                     print("Stockfish initialized successfully!")
                     break
             return process
@@ -68,13 +199,12 @@ class ChessBoard:
         settings = self.DIFFICULTY_SETTINGS[difficulty]
 
         # Configure Stockfish settings
-        commands = [
-            "setoption name Skill Level value {}".format(settings["skill_level"]),
-            "setoption name UCI_LimitStrength value true",
-        ]
-
-        for command in commands:
-            self.send_to_stockfish(command)
+        self.send_to_stockfish(
+            [
+                "setoption name Skill Level value {}".format(settings["skill_level"]),
+                "setoption name UCI_LimitStrength value true",
+            ]
+        )
 
         self.search_depth = settings["depth"]
         print(f"Difficulty set to {difficulty}")
@@ -82,113 +212,172 @@ class ChessBoard:
         print(f"Search Depth: {settings['depth']}")
 
     def setup_board(self):
-        """Set up the board with the initial positions of all pieces."""
-        piece_order = [
-            "rook",
-            "knight",
-            "bishop",
-            "queen",
-            "king",
-            "bishop",
-            "knight",
-            "rook",
-        ]
+        """Set up the bitboards with the initial positions of all pieces."""
+        piece_order = [ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK]
+        self.bb = [0] * 12
+        self.squares = bytearray([EMPTY]) * 64
         for col in range(8):
-            self.board[1][col] = ChessPiece("black", "pawn")
-            self.board[0][col] = ChessPiece("black", piece_order[col])
-            self.board[6][col] = ChessPiece("white", "pawn")
-            self.board[7][col] = ChessPiece("white", piece_order[col])
+            self.bb[COLOR_OFFSET["black"] + PAWN] |= 1 << SQ(1, col)
+            self.bb[COLOR_OFFSET["black"] + piece_order[col]] |= 1 << SQ(0, col)
+            self.bb[COLOR_OFFSET["white"] + PAWN] |= 1 << SQ(6, col)
+            self.bb[COLOR_OFFSET["white"] + piece_order[col]] |= 1 << SQ(7, col)
+            self.squares[SQ(1, col)] = COLOR_OFFSET["black"] + PAWN
+            self.squares[SQ(0, col)] = COLOR_OFFSET["black"] + piece_order[col]
+            self.squares[SQ(6, col)] = COLOR_OFFSET["white"] + PAWN
+            self.squares[SQ(7, col)] = COLOR_OFFSET["white"] + piece_order[col]
+        # Piece lists: the squares occupied by each piece index, so callers
+        # iterating one side's pieces touch O(#pieces) entries, not 64.
+        self.piece_squares = [array("b") for _ in range(12)]
+        for sq, index in enumerate(self.squares):
+            if index != EMPTY:
+                self.piece_squares[index].append(sq)
+        self.color_bb["white"] = self._union(0, 6)
+        self.color_bb["black"] = self._union(6, 12)
+        self.occ = self.color_bb["white"] | self.color_bb["black"]
+        self.moved = 0
+        # Reusable per-rank byte buffers for FEN encoding; a rank's FEN
+        # substring never exceeds 8 bytes.
+        self._rank_buf = [bytearray(8) for _ in range(8)]
+        self._fen_ranks = [self._encode_rank(row) for row in range(8)]
+        self.zobrist = 0
+        for index, bb in enumerate(self.bb):
+            while bb:
+                sq = (bb & -bb).bit_length() - 1
+                self.zobrist ^= ZOBRIST_PIECE[index][sq]
+                bb &= bb - 1
+
+    def piece_count(self, piece_index):
+        """Count pieces of one (color, type) via the POPCNT-backed bit_count."""
+        return self.bb[piece_index].bit_count()
+
+    def color_piece_count(self, color):
+        """Count all pieces of one color without scanning squares."""
+        return self.color_bb[color].bit_count()
+
+    def _piece_lists_consistent(self):
+        """Debug check that the piece lists mirror the bitboards."""
+        for index, bb in enumerate(self.bb):
+            squares = []
+            while bb:
+                squares.append((bb & -bb).bit_length() - 1)
+                bb &= bb - 1
+            if sorted(self.piece_squares[index]) != squares:
+                return False
+        return True
+
+    def _union(self, start, stop):
+        """OR together a contiguous range of piece bitboards."""
+        union = 0
+        for bb in self.bb[start:stop]:
+            union |= bb
+        return union
+
+    def _piece_index_at(self, row, col):
+        """Return the piece index (0-11) at a square, or EMPTY."""
+        return self.squares[SQ(row, col)]
+
+    def piece_targets(self, index, from_sq):
+        """Bitboard of squares the piece with this index may move to."""
+        color = PIECES[index][0]
+        return TARGETS[index](self, from_sq, color) & ~self.color_bb[color]
+
+    def is_path_clear(self, from_pos, to_pos):
+        """True if no piece stands strictly between two aligned squares.
+
+        Unaligned pairs trivially report clear; one BETWEEN lookup and an
+        occupancy AND, with no attack-table work.
+        """
+        return not squares_between(SQ(*from_pos), SQ(*to_pos)) & self.occ
 
     def is_valid_move(self, from_pos, to_pos, piece):
-        """Validates the basic movement logic for each piece."""
-        from_row, from_col = from_pos
+        """Validates the basic movement logic for each piece.
+
+        Boolean shim over piece_targets; make_move uses the target
+        bitboard directly so validation and application share one pass.
+        """
         to_row, to_col = to_pos
 
         if not self.is_valid_position(to_row, to_col):
             return False
 
-        target_piece = self.get_piece(to_row, to_col)
-        if target_piece and target_piece.color == piece.color:
-            return False
+        index = COLOR_OFFSET[piece.color] + piece.piece_type
+        return bool(self.piece_targets(index, SQ(*from_pos)) >> SQ(to_row, to_col) & 1)
 
-        if piece.piece_type == "pawn":
-            direction = 1 if piece.color == "black" else -1
-            if to_col == from_col:
-                if to_row == from_row + direction:
-                    return not target_piece  # Normal move
-                if not piece.has_moved and to_row == from_row + 2 * direction:
-                    return not target_piece  # First double move
-            elif abs(to_col - from_col) == 1 and to_row == from_row + direction:
-                return target_piece is not None  # Capture move
-            return False
-        elif piece.piece_type == "rook":
-            return from_row == to_row or from_col == to_col
-        elif piece.piece_type == "knight":
-            return abs(from_row - to_row) * abs(from_col - to_col) == 2
-        elif piece.piece_type == "bishop":
-            return abs(from_row - to_row) == abs(from_col - to_col)
-        elif piece.piece_type == "queen":
-            return (from_row == to_row or from_col == to_col) or (
-                abs(from_row - to_row) == abs(from_col - to_col)
-            )
-        elif piece.piece_type == "king":
-            return max(abs(from_row - to_row), abs(from_col - to_col)) == 1
+    def _encode_rank(self, row):
+        """Encode one board rank as its FEN substring.
 
-        return False
+        Writes into the rank's preallocated byte buffer by index and
+        decodes once at the end, instead of growing a str per square.
+        """
+        buf = self._rank_buf[row]
+        length = 0
+        empty_count = 0
+        for col in range(8):
+            index = self.squares[SQ(row, col)]
+            if index == EMPTY:
+                empty_count += 1
+            else:
+                if empty_count > 0:
+                    buf[length] = 0x30 + empty_count  # ASCII digit
+                    length += 1
+                    empty_count = 0
+                buf[length] = FEN_CHAR[index]
+                length += 1
+        if empty_count > 0:
+            buf[length] = 0x30 + empty_count
+            length += 1
+        return buf[:length].decode("ascii")
 
     def get_fen(self):
-        """Convert the current board state to FEN notation for Stockfish."""
-        fen_rows = []
-        for row in self.board:
-            empty_count = 0
-            fen_row = ""
-            for piece in row:
-                if piece is None:
-                    empty_count += 1
-                else:
-                    if empty_count > 0:
-                        fen_row += str(empty_count)
-                        empty_count = 0
-                    symbol = (
-                        piece.piece_type[0].lower()
-                        if piece.color == "black"
-                        else piece.piece_type[0].upper()
-                    )
-                    if piece.piece_type == "knight":
-                        symbol = "n" if piece.color == "black" else "N"
-                    fen_row += symbol
-            if empty_count > 0:
-                fen_row += str(empty_count)
-            fen_rows.append(fen_row)
+        """Convert the current board state to FEN notation for Stockfish.
 
+        The piece placement field is served from the per-rank cache that
+        make_move keeps up to date, so no board scan happens here.
+        """
         turn = "w" if self.current_turn == "white" else "b"
-        return f"{'/'.join(fen_rows)} {turn} KQkq - 0 1"
+        return f"{'/'.join(self._fen_ranks)} {turn} KQkq - 0 1"
+
+    def send_to_stockfish(self, commands):
+        """Send one or more commands to Stockfish in a single buffered write.
 
-    def send_to_stockfish(self, command):
-        """Send a command to Stockfish and get the response."""
-        self.stockfish_process.stdin.write(f"{command}\n")
+        Returns the bestmove when a go command is among them, else "".
+        """
+        if isinstance(commands, str):
+            commands = [commands]
+        self.stockfish_process.stdin.write(("\n".join(commands) + "\n").encode("ascii"))
         self.stockfish_process.stdin.flush()
 
-        if "go" in command:
+        if any(command.startswith("go") for command in commands):
             while True:
-                output = self.stockfish_process.stdout.readline().strip()
-                if output.startswith("bestmove"):
-                    return output.split()[1]
+                output = self.stockfish_process.stdout.readline()
+                if output.startswith(b"bestmove"):
+                    return output.split()[1].decode("ascii")
         return ""
 
-    def get_computer_move(self):
-        """Get the best move from Stockfish based on current difficulty settings."""
+    def _bestmove_for_position(self, zobrist, depth):
+        """Query Stockfish for the current position's best move.
+
+        The zobrist argument identifies the current board state, so the
+        LRU wrapper around this method can replay the answer whenever the
+        same position recurs at the same depth.
+        """
         fen = self.get_fen()
-        self.send_to_stockfish(f"position fen {fen}")
-        best_move = self.send_to_stockfish(f"go depth {self.search_depth}")
-        return best_move
+        return self.send_to_stockfish([f"position fen {fen}", f"go depth {depth}"])
+
+    def get_computer_move(self):
+        """Get the best move from Stockfish based on current difficulty settings.
+
+        Repeated positions are served from the (zobrist, depth)-keyed LRU
+        cache without a Stockfish round-trip.
+        """
+        return self._cached_bestmove(self.zobrist, self.search_depth)
 
     def make_computer_move(self):
         """Execute the computer's move."""
         move = self.get_computer_move()
         if move:
-            from_pos = (8 - int(move[1]), ord(move[0]) - ord("a"))
-            to_pos = (8 - int(move[3]), ord(move[2]) - ord("a"))
+            from_pos = convert_position(move[:2])
+            to_pos = convert_position(move[2:4])
 
             success, message = self.make_move(from_pos, to_pos)
             if success:
@@ -199,7 +388,7 @@ class ChessBoard:
         return False
 
     def make_move(self, from_pos, to_pos):
-        """Execute a move on the board."""
+        """Execute a move by toggling bits on the affected bitboards."""
         from_row, from_col = from_pos
         to_row, to_col = to_pos
 
@@ -209,17 +398,44 @@ class ChessBoard:
         ):
             return False, "Invalid position"
 
-        piece = self.get_piece(from_row, from_col)
-        if not piece:
+        from_sq = SQ(from_row, from_col)
+        to_sq = SQ(to_row, to_col)
+        index = self.squares[from_sq]
+        if index == EMPTY:
             return False, "No piece at the starting position"
-        if piece.color != self.current_turn:
+        color = PIECES[index][0]
+        if color != self.current_turn:
             return False, f"It's {self.current_turn}'s turn"
 
-        if self.is_valid_move(from_pos, to_pos, piece):
+        # Compute the legal-target bitboard once; it both validates the
+        # move and tells us everything needed to apply it.
+        if self.piece_targets(index, from_sq) >> to_sq & 1:
             # Execute the move
-            self.board[to_row][to_col] = piece
-            self.board[from_row][from_col] = None
-            piece.has_moved = True
+            captured = self.squares[to_sq]
+            if captured != EMPTY:
+                captured_color = PIECES[captured][0]
+                self.bb[captured] &= ~(1 << to_sq)
+                self.color_bb[captured_color] &= ~(1 << to_sq)
+                self.zobrist ^= ZOBRIST_PIECE[captured][to_sq]
+                self.piece_squares[captured].remove(to_sq)
+            move_mask = (1 << from_sq) | (1 << to_sq)
+            self.bb[index] ^= move_mask
+            self.color_bb[color] ^= move_mask
+            self.squares[to_sq] = index
+            self.squares[from_sq] = EMPTY
+            self.piece_squares[index].remove(from_sq)
+            self.piece_squares[index].append(to_sq)
+            assert self._piece_lists_consistent()
+            self.zobrist ^= (
+                ZOBRIST_PIECE[index][from_sq]
+                ^ ZOBRIST_PIECE[index][to_sq]
+                ^ ZOBRIST_SIDE
+            )
+            self.occ = self.color_bb["white"] | self.color_bb["black"]
+            self.moved = (self.moved & ~(1 << from_sq)) | (1 << to_sq)
+            self._fen_ranks[from_row] = self._encode_rank(from_row)
+            if to_row != from_row:
+                self._fen_ranks[to_row] = self._encode_rank(to_row)
             self.current_turn = "black" if self.current_turn == "white" else "white"
             return True, "Move successful"
         return False, "Invalid move"
@@ -229,35 +445,25 @@ class ChessBoard:
         return 0 <= row < 8 and 0 <= col < 8
 
     def get_piece(self, row, col):
-        """Get the piece at a specific position."""
-        return self.board[row][col] if self.is_valid_position(row, col) else None
+        """Get a ChessPiece view of the piece at a position, or None."""
+        if not self.is_valid_position(row, col):
+            return None
+        index = self._piece_index_at(row, col)
+        if index == EMPTY:
+            return None
+        color, piece_type = PIECES[index]
+        piece = ChessPiece(color, piece_type)
+        piece.has_moved = bool((self.moved >> SQ(row, col)) & 1)
+        return piece
 
     def print_board(self):
-        """Display the current board state."""
-        piece_symbols = {
-            "white": {
-                "king": "♔",
-                "queen": "♕",
-                "rook": "♖",
-                "bishop": "♗",
-                "knight": "♘",
-                "pawn": "♙",
-            },
-            "black": {
-                "king": "♚",
-                "queen": "♛",
-                "rook": "♜",
-                "bishop": "♝",
-                "knight": "♞",
-                "pawn": "♟",
-            },
-        }
-        print("\n  a b c d e f g h")
+        """Display the current board state with a single buffered write."""
+        rows = ["", "  a b c d e f g h"]
         for row in range(8):
-            print(f"{8 - row}", end=" ")
-            for col in range(8):
-                piece = self.board[row][col]
-                symbol = piece_symbols[piece.color][piece.piece_type] if piece else "·"
-                print(symbol, end=" ")
-            print(f"{8 - row}")
-        print("  a b c d e f g h\n")
+            rank = 8 - row
+            cells = " ".join(
+                SYMBOLS[self._piece_index_at(row, col)] for col in range(8)
+            )
+            rows.append(f"{rank} {cells} {rank}")
+        rows.append("  a b c d e f g h\n")
+        sys.stdout.write("\n".join(rows) + "\n")
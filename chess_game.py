@@ -1,5 +1,5 @@
 from board_setup import ChessBoard
-from utils import convert_position  # noqa: F401
+from utils import convert_position
 
 
 def select_difficulty():
@@ -60,20 +60,15 @@ def main():
                     break
 
                 # Convert chess notation to board indices
-                from_col = ord(move_from[0].lower()) - ord("a")
-                from_row = 8 - int(move_from[1])
-                to_col = ord(move_to[0].lower()) - ord("a")
-                to_row = 8 - int(move_to[1])
-
                 success, message = game.make_move(
-                    (from_row, from_col), (to_row, to_col)
+                    convert_position(move_from), convert_position(move_to)
                 )
                 print(message)
 
                 if not success:
                     continue
 
-            except (IndexError, ValueError) as e:  # noqa: F841
+            except KeyError:
                 print("Invalid input format. Please use the format 'e2'.")
                 continue
 
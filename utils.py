@@ -1,8 +1,19 @@
+# Every square name ("a1".."h8", plus uppercase-file variants) mapped to
+# (row, col) board indices once at import, so conversion is one dict lookup.
+POS_LUT = {
+    f"{file}{rank}": (8 - rank, ord(file) - 97)
+    for file in "abcdefgh"
+    for rank in range(1, 9)
+}
+POS_LUT.update({key.upper(): value for key, value in POS_LUT.items()})
+
+
 def convert_position(position):
-    """Convert a position like 'e2' into board indices (row, col)."""
-    col = ord(position[0].lower()) - ord("a")
-    row = 8 - int(position[1])
-    return row, col
+    """Convert a position like 'e2' into board indices (row, col).
+
+    Raises KeyError for anything that is not a square name.
+    """
+    return POS_LUT[position]
 
 
 def convert_position_to_uci(row, col):